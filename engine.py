@@ -0,0 +1,317 @@
+# dispatch engine: runs compiled jobs against an input backend + clock
+#
+# a "job" is a plain dict of settings (see compile_job) so it can be built
+# from the ui, by hand, or in the simulator. the backend is anything with the
+# `inputs` api (the real sendinput wrapper by default) and the clock is
+# anything with time() / perf_counter() / sleep() (the `time` module by
+# default). scheduling runs on perf_counter(), time() only places deadlines.
+
+import time
+import math
+import csv
+
+import input_codes as codes
+
+# ================== Jobs ==================
+
+def compile_job(ui, mode):
+    """reads the ui widgets once and returns a job dict for the given mode"""
+    job = {
+        "mode": mode,
+        "interval": float(ui["interval_entry"].get()),
+        "limit": None,
+    }
+
+    # stop limit (a count of 0 keeps meaning "no limit")
+    stop_mode = ui["stop_after_mode"].get()
+    if stop_mode == "after x":
+        count = int(ui["max_iterations_entry"].get())
+        if count: job["limit"] = {"kind": "count", "value": count}
+    elif stop_mode == "after seconds":
+        job["limit"] = {"kind": "duration", "value": float(ui["max_seconds_entry"].get())}
+    elif stop_mode == "at time":
+        job["limit"] = {"kind": "deadline", "value": parse_deadline(ui["deadline_entry"].get())}
+
+    if mode == "AutoClick":
+        job["button"] = ui["button_choice"].get()
+        job["location_mode"] = ui["click_mode_choice"].get()
+        job["x"] = int(ui["click_x"].get())
+        job["y"] = int(ui["click_y"].get())
+    elif mode == "AutoKeyPress":
+        modifiers = []
+        if ui["shift_modifier"].get(): modifiers.append("shift")
+        if ui["control_modifier"].get(): modifiers.append("ctrl")
+        if ui["alt_modifier"].get(): modifiers.append("alt")
+        key = ui["key_entry"].get().strip()
+        if key: modifiers.append(key)
+        job["keys"] = "+".join(modifiers)
+    elif mode == "KeySequence":
+        job["timeline"], job["length"] = compile_sequence(ui["sequence_text"].get("1.0", "end"))
+        if job["length"] + job["interval"] <= 0:
+            raise ValueError("Key sequence needs a hold time or an interval to repeat on")
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+    return job
+
+def parse_deadline(text, now=None):
+    """turns "HH:MM" or "HH:MM:SS" (local time) into an epoch timestamp, rolling over to tomorrow if it already passed"""
+    parts = [int(p) for p in text.strip().split(":")]
+    if len(parts) == 2: parts.append(0)
+    if len(parts) != 3: raise ValueError(f"Bad deadline (expected HH:MM[:SS]): {text}")
+    hours, minutes, seconds = parts
+    # mktime would quietly roll 25:00 or 12:99 over into the next hour/day
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59 and 0 <= seconds <= 59):
+        raise ValueError(f"Bad deadline (out of range): {text}")
+
+    now = time.time() if now is None else now
+    local = time.localtime(now)
+    deadline = time.mktime((local.tm_year, local.tm_mon, local.tm_mday, hours, minutes, seconds, 0, 0, -1))
+    if deadline <= now: deadline += 24 * 60 * 60
+    return deadline
+
+# ================== Key Sequences ==================
+#
+# sequences are written one csv row per line (times in seconds, from the start of the sequence):
+#   key,<name>,<at>,<hold>[,<every>,<until>]   hold a key, optionally repeating every `every` until `until`
+#                                              (hold can't be longer than every)
+#   text,<string>,<at>,<hold>[,<gap>]          type a string, holding each character `hold` seconds
+# a key can't be pressed again, by any row, while it's still held.
+# e.g. hold W for 2s while tapping space every 100ms:
+#   key,W,0,2
+#   key,SPACE,0,0.03,0.1,2
+# everything is merged into one time-sorted timeline of (time, key, down, counted)
+# events, where counted is false for the shift added around uppercase text so
+# it doesn't count as a key press of its own.
+
+def key_code_name(name):
+    """"w", "W", "VK_W" -> "VK_W" """
+    name = name.strip().upper()
+    if name in codes.KEY_CODES: return name
+    if "VK_" + name in codes.KEY_CODES: return "VK_" + name
+    raise ValueError(f"Unknown key: {name}")
+
+def text_keys(char):
+    """returns (key, shifted) for a character that can be typed"""
+    if char in codes.TEXT_KEYS: return codes.TEXT_KEYS[char], False
+    if char in codes.SHIFTED_TEXT_KEYS: return codes.SHIFTED_TEXT_KEYS[char], True
+    if "VK_" + char.upper() in codes.KEY_CODES and char.isalnum():
+        return "VK_" + char.upper(), char.isupper()
+    raise ValueError(f"Can't type character: {char!r}")
+
+def compile_sequence(text):
+    """parses a sequence (see above) into (timeline, length)"""
+    events = []
+    def add(at, key, down, rank, counted=True):
+        events.append((at, rank, len(events), key, down, counted))
+    def hold(key, at, duration):
+        if duration < 0: raise ValueError(f"Negative hold time for {key}: {duration}")
+        add(at, key, True, 1)
+        add(at + duration, key, False, 0 if duration > 0 else 1)
+
+    for row in csv.reader(line for line in text.splitlines() if line.strip() and not line.startswith("#")):
+        kind = row[0].strip().lower()
+        if kind == "key":
+            key = key_code_name(row[1])
+            at, duration = float(row[2]), float(row[3])
+            every = float(row[4]) if len(row) > 4 and row[4].strip() else 0
+            if every > 0:
+                if len(row) < 6: raise ValueError(f"Repeating key needs an until time: {','.join(row)}")
+                # a press can't still be held when the next one starts, its release would cut that one short
+                if duration > every: raise ValueError(f"Hold is longer than the repeat period: {','.join(row)}")
+                until = float(row[5])
+                n = 0
+                while at + n * every < until:
+                    hold(key, at + n * every, duration)
+                    n += 1
+            else:
+                hold(key, at, duration)
+        elif kind == "text":
+            at, duration = float(row[2]), float(row[3])
+            gap = float(row[4]) if len(row) > 4 and row[4].strip() else duration
+            for i, char in enumerate(row[1]):
+                key, shifted = text_keys(char)
+                start = at + i * (duration + gap)
+                if shifted: add(start, "VK_SHIFT", True, 1, counted=False)
+                hold(key, start, duration)
+                if shifted: add(start + duration, "VK_SHIFT", False, 0 if duration > 0 else 1, counted=False)
+        else:
+            raise ValueError(f"Unknown sequence row: {','.join(row)}")
+
+    # by time, releasing earlier holds before anything is pressed at the same
+    # instant. presses and zero-length taps' releases keep file order, so a tap
+    # goes down before up and shift wraps only the letter it modifies
+    events.sort()
+
+    # a key pressed again while it's still held would have the first release cut the second hold short
+    held = set()
+    for at, _, _, key, down, _ in events:
+        if down and key in held: raise ValueError(f"{key} is pressed again at {at}s while it's still held")
+        if down: held.add(key)
+        else: held.discard(key)
+
+    timeline = [(at, key, down, counted) for at, _, _, key, down, counted in events]
+    length = timeline[-1][0] if timeline else 0.0
+    return timeline, length
+
+# ================== Limits ==================
+#
+# a limit is {"kind": ..., "value": ...} (or None for "until stopped"):
+#   count     stop after `value` events
+#   duration  stop after `value` seconds
+#   deadline  stop at wall-clock time `value` (epoch seconds)
+#   until     stop once `value()` returns true (checked before every event)
+
+def plan_limit(limit, interval, start):
+    """
+    precomputes how many events the limit allows when starting at `start`.
+    returns (total, end): total is None when it can't be known up front (no
+    limit, "until" limits, or a timed limit with a zero interval), in which
+    case end is the time the scheduler has to check against instead.
+    """
+    if limit is None or limit["kind"] == "until": return None, None
+    kind, value = limit["kind"], limit["value"]
+    if kind == "count": return max(0, int(value)), None
+
+    if kind == "duration": end = start + value
+    elif kind == "deadline": end = value
+    else: raise ValueError(f"Unknown limit: {kind}")
+
+    if end <= start: return 0, end
+    if interval <= 0: return None, end
+    # events go out at start + n * interval for every n where that's still before end
+    return math.ceil((end - start) / interval - 1e-9), end
+
+def plan_run(limit, interval, clock):
+    """plan_limit for a run starting now: returns (start, end, total) with start/end on clock.perf_counter()"""
+    wall_start, start = clock.time(), clock.perf_counter()
+    total, end = plan_limit(limit, interval, wall_start)
+    if end is not None: end = start + (end - wall_start)
+    return start, end, total
+
+# ================== Actions ==================
+
+def click_once(job, backend):
+    if job["location_mode"] == "cursor position":
+        backend.mouse_click(button=job["button"])
+    elif job["location_mode"] == "fixed position":
+        backend.mouse_click(button=job["button"], x=job["x"], y=job["y"])
+
+def keypress_once(job, backend):
+    backend.press_and_release(job["keys"])
+
+actions = {
+    "AutoClick": click_once,
+    "AutoKeyPress": keypress_once,
+}
+
+# ================== Scheduler ==================
+
+MAX_LATE = 0.05     # key sequence presses later than this get dropped instead of sent
+
+def run_job(job, backend=None, clock=time, running=lambda: True, on_event=None):
+    """
+    fires the job's action every `interval` seconds until running() goes false
+    or the job's limit is reached. events are scheduled against
+    start + n * interval on the clock's perf_counter() (wall time is only used
+    to place deadlines), rather than sleeping a fixed amount after each one.
+    ticks missed during a stall are dropped, not fired in a burst. on_event
+    gets the running total after each event. returns the number of events sent.
+    """
+    if backend is None:
+        import inputs as backend
+    if job["mode"] == "KeySequence":
+        return run_timeline(job, backend, clock, running, on_event)
+    action = actions[job["mode"]]
+    interval = job["interval"]
+    limit = job.get("limit")
+    until = limit["value"] if limit and limit["kind"] == "until" else None
+
+    start, end, total = plan_run(limit, interval, clock)
+    # count limits cap the events sent, timed limits cap the tick index
+    max_count = total if limit and limit["kind"] == "count" else None
+    max_tick = total if max_count is None else None
+
+    def limit_reached():
+        return (max_tick is not None and tick >= max_tick) or (max_count is not None and count >= max_count)
+
+    count = 0
+    tick = 0
+    while running():
+        now = clock.perf_counter()
+        # a stall can jump the tick (and the clock) straight past the end
+        if interval > 0: tick = max(tick, int((now - start) / interval + 1e-9))
+        if limit_reached() or (end is not None and now >= end): break
+        if until and until(): break
+
+        action(job, backend)
+        count += 1
+        tick += 1
+        if on_event: on_event(count)
+        if limit_reached(): break
+
+        delay = start + tick * interval - clock.perf_counter()
+        if delay > 0: clock.sleep(delay)
+    return count
+
+def run_timeline(job, backend, clock, running, on_event):
+    """
+    plays a compiled key sequence from one thread, repeating it every
+    length + interval seconds. everything due at once goes out in a single
+    send_keys batch, except presses more than MAX_LATE late (after a stall),
+    which are dropped along with their releases. a count limit counts key
+    presses (not the shift added for uppercase text) and lets the last held
+    keys finish; timed limits and stopping release whatever is still held.
+    returns the number of key presses sent.
+    """
+    timeline = job["timeline"]
+    period = job["length"] + job["interval"]
+    limit = job.get("limit")
+    until = limit["value"] if limit and limit["kind"] == "until" else None
+
+    start, end, total = plan_run(limit, 0, clock)
+    held = set()
+    pressed = 0
+    i = 0
+    pass_start = wake = start
+    done = total == 0 or not timeline
+    while not done and running():
+        # (whatever we slept until counts as due, even if the clock reads a hair early)
+        now = max(clock.perf_counter(), wake)
+        if end is not None and now >= end: break
+
+        batch = []
+        while True:
+            at, key, down, counted = timeline[i]
+            when = pass_start + at
+            if when > now: break
+            if (end is not None and when >= end) or (until and until()):
+                done = True
+                break
+            i += 1
+            if i == len(timeline): i, pass_start = 0, pass_start + period
+
+            if down:
+                if total is not None and pressed >= total: continue
+                if when < now - MAX_LATE: continue     # missed during a stall, don't burst it
+                if counted: pressed += 1
+                held.add(key)
+            else:
+                if key not in held: continue
+                held.discard(key)
+            batch.append((key, down))
+            if total is not None and pressed >= total and not held:
+                done = True
+                break
+
+        if batch:
+            backend.send_keys(batch)
+            if on_event: on_event(pressed)
+        if done: break
+
+        wake = pass_start + timeline[i][0]
+        if end is not None: wake = min(wake, end)
+        delay = wake - clock.perf_counter()
+        if delay > 0: clock.sleep(delay)
+
+    if held: backend.send_keys([(key, False) for key in sorted(held)])
+    return pressed
@@ -188,6 +188,47 @@ KEY_CODES = {
     "VK_PA1": 0xFD,
     "VK_OEM_CLEAR": 0xFE,
 }
+# characters that can be typed without shift (letters and digits map to VK_<char>)
+TEXT_KEYS = {
+    " ": "VK_SPACE",
+    "\t": "VK_TAB",
+    "\n": "VK_RETURN",
+    ",": "VK_OEM_COMMA",
+    ".": "VK_OEM_PERIOD",
+    "-": "VK_OEM_MINUS",
+    "=": "VK_OEM_PLUS",
+    ";": "VK_OEM_1",
+    "/": "VK_OEM_2",
+    "`": "VK_OEM_3",
+    "[": "VK_OEM_4",
+    "\\": "VK_OEM_5",
+    "]": "VK_OEM_6",
+    "'": "VK_OEM_7",
+}
+# characters typed with shift held (us layout)
+SHIFTED_TEXT_KEYS = {
+    "!": "VK_1",
+    "@": "VK_2",
+    "#": "VK_3",
+    "$": "VK_4",
+    "%": "VK_5",
+    "^": "VK_6",
+    "&": "VK_7",
+    "*": "VK_8",
+    "(": "VK_9",
+    ")": "VK_0",
+    "_": "VK_OEM_MINUS",
+    "+": "VK_OEM_PLUS",
+    ":": "VK_OEM_1",
+    "?": "VK_OEM_2",
+    "~": "VK_OEM_3",
+    "{": "VK_OEM_4",
+    "|": "VK_OEM_5",
+    "}": "VK_OEM_6",
+    "\"": "VK_OEM_7",
+    "<": "VK_OEM_COMMA",
+    ">": "VK_OEM_PERIOD",
+}
 def readable_key_list():    
     d = {}
     for key in KEY_CODES: 
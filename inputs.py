@@ -65,6 +65,22 @@ def key_press(key: str):
     key_down(key)
     key_up(key)
 
+def send_keys(events):
+    """sends a batch of (key, down) events in a single SendInput call"""
+    n = len(events)
+    batch = (INPUT * n)()
+    for i, (key, down) in enumerate(events):
+        # KEY_CODES are virtual-key codes, so they go in wVk (not wScan + KEYEVENTF_SCANCODE)
+        flags = 0 if down else KEYEVENTF_KEYUP
+        batch[i] = INPUT(type=INPUT_KEYBOARD,
+                         ki=KEYBDINPUT(codes.KEY_CODES[key], 0, flags, 0, None))
+    SendInput(n, batch, ctypes.sizeof(INPUT))
+
+def press_and_release(keys: str):
+    """presses a keyboard-lib style combo like "shift+a" """
+    import keyboard
+    keyboard.press_and_release(keys)
+
 # mouse functions            
 def mouse_click(button="left", x=None, y=None):
     """clicks mouse at current cursor pos, or moves + clicks if x,y are given"""            
@@ -21,7 +21,8 @@ import pyautogui
 import keyboard
 import ctypes   
 
-import inputs  
+import engine
+import worker
 from input_codes import readable_key_list as KEY_LIST
 KEY_LIST = KEY_LIST()      
 
@@ -29,8 +30,9 @@ KEY_LIST = KEY_LIST()
 
 clicking = False
 click_thread = None
+dispatch_worker = None      # worker process, started the first time it's used
 current_hotkey = "F4"       # default toggle hotkey
-current_mode = "AutoClick"  # default mode (AutoClick/AutoKeyPress)           
+current_mode = "AutoClick"  # default mode (AutoClick/AutoKeyPress/KeySequence)           
 root = None
 hotkey = None
 CUSTOM_FONT = ("Arial", 10)   
@@ -63,75 +65,55 @@ def increment_stat(name, value=1):
     
 # ================== Actions ==================
    
-def autoclick(ui, start_value):
-    interval = float(ui["interval_entry"].get())
-    max_iterations = int(ui["max_iterations_entry"].get())
-    button = ui["button_choice"].get()
-    location_mode = ui["click_mode_choice"].get()
-
-    x = int(ui["click_x"].get())
-    y = int(ui["click_y"].get())    
-
-    while clicking:
-        if location_mode == "cursor position":
-            inputs.mouse_click(button=button)    
-        elif location_mode == "fixed position":
-            inputs.mouse_click(button=button, x=x, y=y)     
-            
-        increment_stat("Clicks")     
-        if max_iterations and stats["Clicks"] - start_value >= max_iterations: stop_action(ui)
-        time.sleep(interval)
-
-def autokeypress(ui, start_value):
-    interval = float(ui["interval_entry"].get())
-    max_iterations = int(ui["max_iterations_entry"].get())
-    modifiers = []
-    if ui["shift_modifier"].get(): modifiers.append("shift")
-    if ui["control_modifier"].get(): modifiers.append("ctrl")
-    if ui["alt_modifier"].get(): modifiers.append("alt")
-    key = ui["key_entry"].get().strip()
-    if key: modifiers.append(key)
-    keys = "+".join(modifiers)
-
-    while clicking:
-        keyboard.press_and_release(keys)   
-         
-        increment_stat("Keys Pressed")
-        if max_iterations and stats["Keys Pressed"] - start_value >= max_iterations: stop_action(ui)
-        time.sleep(interval)
-
-actions = {
-    "AutoClick": autoclick,
-    "AutoKeyPress": autokeypress,   
-}
+def run_action(job, stat_name):
+    # runs on the worker thread: only touches the stats dict, the sampler draws it
+    base = stats[stat_name]
+    def on_event(count): stats[stat_name] = base + count
+    engine.run_job(job, running=lambda: clicking, on_event=on_event)
 
 def start_action(ui):
-    global clicking, click_thread, start_time 
+    global clicking, click_thread, dispatch_worker, start_time 
     if clicking: return
 
+    job = engine.compile_job(ui, current_mode)
+    stat_name = "Clicks" if current_mode == "AutoClick" else "Keys Pressed"
+
     clicking = True
     ui["start_button"].config(state="disabled")
     ui["stop_button"].config(state="normal")
     start_time = time.time()
     if ui["reset_stats"].get(): reset_all_stats()
 
-    def update_time():
-        elapsed = time.time() - start_time
-        update_stat("Elapsed Time", elapsed)
-        if clicking: root.after(50, update_time)
-    update_time()
-
-    stat_name = "Clicks" if current_mode == "AutoClick" else "Keys Pressed"
-    start_value = stats[stat_name]
-
-    click_thread = threading.Thread(target=actions[current_mode], args=(ui, start_value,), daemon=True)
-    click_thread.start()
+    if ui["separate_process"].get():
+        # counters come out of the worker's shared memory block
+        # (re)started on demand, a worker that died is replaced rather than written to
+        if dispatch_worker is None or not dispatch_worker.alive: dispatch_worker = worker.DispatchWorker()
+        base = stats[stat_name]
+        dispatch_worker.run(job)
+        read_count = lambda: base + dispatch_worker.count
+        engine_running = lambda: dispatch_worker.running
+    else:
+        click_thread = threading.Thread(target=run_action, args=(job, stat_name,), daemon=True)
+        click_thread.start()
+        read_count = lambda: stats[stat_name]
+        engine_running = click_thread.is_alive
+
+    def sample_stats():
+        update_stat("Elapsed Time", time.time() - start_time)
+        update_stat(stat_name, read_count())
+        # the engine hit its limit, finish up on the tk thread
+        if clicking and not engine_running(): stop_action(ui)
+        if clicking: root.after(50, sample_stats)
+    sample_stats()
 
 def stop_action(ui):
     global clicking
     clicking = False
     ui["start_button"].config(state="normal")
     ui["stop_button"].config(state="disabled")
+    if dispatch_worker and dispatch_worker.alive:
+        try: dispatch_worker.stop()
+        except OSError: pass    # it died just now, start_action replaces it
 
 
 # ================== Hotkey ==================     
@@ -241,7 +223,7 @@ def main():
 
     root = tk.Tk()       
     root.title("Input Automator")
-    root.geometry("430x730")
+    root.geometry("430x815")
     root.resizable(False, False)
 
     ui = {}
@@ -319,10 +301,19 @@ def main():
     ui["alt_modifier"] = tk.BooleanVar(value=False)
     tk.Checkbutton(key_tab, variable=ui['alt_modifier'], font=CUSTOM_FONT).grid(row=4, column=1, padx=5, sticky="w")
 
+    # ------------------ KeySequence Tab ------------------
+    sequence_tab = tk.Frame(notebook, padx=10, pady=10)
+    notebook.add(sequence_tab, text="KeySequence")
+
+    tk.Label(sequence_tab, text="key,<key>,<at>,<hold>[,<every>,<until>]\ntext,<text>,<at>,<hold>[,<gap>]", fg="gray", justify="left", font=CUSTOM_FONT).grid(row=0, column=0, sticky="w")
+    ui["sequence_text"] = tk.Text(sequence_tab, width=44, height=5, font=CUSTOM_FONT)
+    ui["sequence_text"].insert("1.0", "key,W,0,2\nkey,SPACE,0,0.03,0.1,2")
+    ui["sequence_text"].grid(row=1, column=0, sticky="w")
+
     def on_tab_change(event):
         global current_mode
         tab_index = notebook.index(notebook.select())
-        current_mode = "AutoClick" if tab_index == 0 else "AutoKeyPress"  
+        current_mode = ["AutoClick", "AutoKeyPress", "KeySequence"][tab_index]
     notebook.bind("<<NotebookTabChanged>>", on_tab_change)
 
     # ------------------ Shared Settings ------------------
@@ -343,6 +334,11 @@ def main():
     ui["reset_stats"] = tk.BooleanVar(value=True)
     tk.Checkbutton(general_frame, variable=ui["reset_stats"], font=CUSTOM_FONT).grid(row=3, column=1, sticky="w")
 
+    # Dispatch from a separate process (keeps the ui and hotkeys out of the timing)
+    tk.Label(general_frame, text="Run in separate process:", font=CUSTOM_FONT).grid(row=4, column=0, sticky="w")
+    ui["separate_process"] = tk.BooleanVar(value=False)
+    tk.Checkbutton(general_frame, variable=ui["separate_process"], font=CUSTOM_FONT).grid(row=4, column=1, sticky="w")
+
     # Stop mode     
     stop_mode = tk.Frame(shared_frame, padx=10, pady=10)
     stop_mode.grid(row=1, column=0, sticky="w")
@@ -352,7 +348,17 @@ def main():
     ui["max_iterations_entry"].insert(0, "0")
     ui["max_iterations_entry"].grid(row=1, column=1, padx=5, sticky="w")
     tk.Label(stop_mode, text="inputs", font=CUSTOM_FONT).grid(row=1, column=2, sticky="w")
-    tk.Radiobutton(stop_mode, text="Repeat until stopped", value="until stopped", variable=ui['stop_after_mode'], font=CUSTOM_FONT).grid(row=2, column=0)
+    tk.Radiobutton(stop_mode, text="Stop after:", value="after seconds", variable=ui['stop_after_mode'], font=CUSTOM_FONT).grid(row=2, column=0, sticky="w")
+    ui["max_seconds_entry"] = tk.Entry(stop_mode, width=10, font=CUSTOM_FONT)
+    ui["max_seconds_entry"].insert(0, "60")
+    ui["max_seconds_entry"].grid(row=2, column=1, padx=5, sticky="w")
+    tk.Label(stop_mode, text="seconds", font=CUSTOM_FONT).grid(row=2, column=2, sticky="w")
+    tk.Radiobutton(stop_mode, text="Stop at:", value="at time", variable=ui['stop_after_mode'], font=CUSTOM_FONT).grid(row=3, column=0, sticky="w")
+    ui["deadline_entry"] = tk.Entry(stop_mode, width=10, font=CUSTOM_FONT)
+    ui["deadline_entry"].insert(0, "12:00")
+    ui["deadline_entry"].grid(row=3, column=1, padx=5, sticky="w")
+    tk.Label(stop_mode, text="(HH:MM[:SS])", font=CUSTOM_FONT).grid(row=3, column=2, sticky="w")
+    tk.Radiobutton(stop_mode, text="Repeat until stopped", value="until stopped", variable=ui['stop_after_mode'], font=CUSTOM_FONT).grid(row=4, column=0)
 
     # ------------------ Control Buttons ------------------     
     control_frame = tk.LabelFrame(root, text="Controls", padx=10, pady=10, font=CUSTOM_FONT)
@@ -0,0 +1,131 @@
+# dry-run simulator: runs jobs against a virtual clock + fake backend
+#
+# nothing here touches the real mouse/keyboard (or even imports `inputs`),
+# so long macros can be replayed and checked on any machine, e.g.
+#
+#   result = simulate({"mode": "AutoClick", "interval": 0.5, ...}, run_for=7200)
+#   problems = verify(result, duration=7200, counts={"mouse_click": 14400})
+
+import time
+
+import engine
+
+# ================== Virtual Clock ==================
+
+class VirtualClock:
+    """stands in for the `time` module: sleep() just moves the clock forward"""
+    def __init__(self, start=0.0):
+        self.now = float(start)
+
+    def time(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0: self.now += seconds
+
+# ================== Simulated Backend ==================
+
+class SimulatedInputs:
+    """same api as `inputs`, but every call is appended to `trace` as (time, name, args)"""
+    def __init__(self, clock):
+        self.clock = clock
+        self.trace = []
+        self.batches = 0    # send_keys calls, i.e. SendInput calls a real run would make
+
+    def _record(self, name, **args):
+        self.trace.append((self.clock.time(), name, args))
+
+    def key_down(self, key: str): self._record("key_down", key=key)
+    def key_up(self, key: str): self._record("key_up", key=key)
+    def key_press(self, key: str): self._record("key_press", key=key)
+    def press_and_release(self, keys: str): self._record("press_and_release", keys=keys)
+
+    def send_keys(self, events):
+        self.batches += 1
+        for key, down in events: self._record("key_down" if down else "key_up", key=key)
+
+    def mouse_click(self, button="left", x=None, y=None): self._record("mouse_click", button=button, x=x, y=y)
+    def mouse_down(self, button="left"): self._record("mouse_down", button=button)
+    def mouse_up(self, button="left"): self._record("mouse_up", button=button)
+    def move_mouse(self, x, y, absolute=False): self._record("move_mouse", x=x, y=y, absolute=absolute)
+    def scroll_mouse(self, amount=120): self._record("scroll_mouse", amount=amount)
+
+# ================== Simulation ==================
+
+def simulate(job, run_for=None, start=None):
+    """
+    runs a job (or a program, i.e. a list of jobs run back to back) as fast as
+    possible. run_for caps the virtual run time for jobs that would otherwise
+    repeat until stopped. the virtual clock starts at `start`, which defaults to
+    now when a job has a deadline (those are epoch times) and 0 otherwise.
+    returns a dict with the trace and summary numbers.
+    """
+    jobs = job if isinstance(job, list) else [job]
+    has_deadline = False
+    for j in jobs:
+        if not run_for and j.get("limit") is None:
+            raise ValueError("Job repeats until stopped; pass run_for to simulate it")
+        if j.get("limit") and j["limit"]["kind"] == "deadline": has_deadline = True
+        # the virtual clock only moves when the engine sleeps, and a zero interval never does
+        period = j["length"] + j["interval"] if j["mode"] == "KeySequence" else j["interval"]
+        counted = j.get("limit") and j["limit"]["kind"] == "count" and j["mode"] != "KeySequence"
+        if period <= 0 and not counted:
+            raise ValueError("Job with a zero interval only ends on a count limit in the simulator")
+    if start is None: start = time.time() if has_deadline else 0.0
+
+    clock = VirtualClock(start)
+    backend = SimulatedInputs(clock)
+    end = start + run_for if run_for else None
+    running = (lambda: clock.time() < end) if end is not None else (lambda: True)
+
+    count = 0
+    for j in jobs:
+        if not running(): break
+        count += engine.run_job(j, backend=backend, clock=clock, running=running)
+
+    counts = {}
+    for _, name, _ in backend.trace:
+        counts[name] = counts.get(name, 0) + 1
+
+    return {
+        "trace": backend.trace,
+        "count": count,
+        "counts": counts,
+        "batches": backend.batches,
+        "start": start,
+        "run_for": run_for,
+        "duration": clock.time() - start,
+    }
+
+def verify(result, job=None, duration=None, count=None, counts=None, tolerance=1e-6):
+    """checks a simulate() result against expectations, returns a list of problems (empty = ok)"""
+    problems = []
+    if duration is not None and abs(result["duration"] - duration) > tolerance:
+        problems.append(f"duration: expected {duration}, got {result['duration']}")
+    if count is not None and result["count"] != count:
+        problems.append(f"count: expected {count}, got {result['count']}")
+    for name, expected in (counts or {}).items():
+        got = result["counts"].get(name, 0)
+        if got != expected:
+            problems.append(f"{name}: expected {expected}, got {got}")
+
+    # the job's own stop limit: exactly as many events as it allows, none past its end
+    # (releasing keys that were still held when a timed limit ran out doesn't count)
+    times = [t for t, _, _ in result["trace"]]
+    if job is not None and job.get("limit"):
+        interval = 0 if job["mode"] == "KeySequence" else job["interval"]
+        total, end = engine.plan_limit(job["limit"], interval, result["start"])
+        cut_short = result["run_for"] and result["duration"] >= result["run_for"]
+        if total is not None and (result["count"] > total or (result["count"] < total and not cut_short)):
+            problems.append(f"{job['limit']['kind']} limit allows {total} events, but {result['count']} were sent")
+        sent = [t for t, name, _ in result["trace"] if name != "key_up"]
+        if end is not None and sent and sent[-1] >= end:
+            problems.append(f"{job['limit']['kind']} limit ends at {end}, but events were sent until {sent[-1]}")
+
+    # timestamps must never go backwards
+    if any(b < a for a, b in zip(times, times[1:])):
+        problems.append("trace timestamps are not in order")
+    return problems
@@ -0,0 +1,84 @@
+# stop limits in the engine scheduler, run with `python -m pytest`
+
+import time
+
+import pytest
+
+import engine
+import simulator
+
+def click_job(interval, limit):
+    return {"mode": "AutoClick", "interval": interval, "limit": limit,
+            "button": "left", "location_mode": "cursor position", "x": 0, "y": 0}
+
+class StallClock(simulator.VirtualClock):
+    """virtual clock that loses `stall` seconds once it passes `at`, like a suspend or a long hang"""
+    def __init__(self, at, stall):
+        super().__init__()
+        self.at, self.stall = at, stall
+
+    def sleep(self, seconds):
+        super().sleep(seconds)
+        if self.stall and self.now > self.at:
+            self.now += self.stall
+            self.stall = 0
+
+def run_stalled(job, clock, run_for):
+    backend = simulator.SimulatedInputs(clock)
+    count = engine.run_job(job, backend=backend, clock=clock, running=lambda: clock.now < run_for)
+    return count, [t for t, _, _ in backend.trace]
+
+def test_duration_limit_has_no_overshoot():
+    job = click_job(0.001, {"kind": "duration", "value": 0.3})
+    result = simulator.simulate(job, start=1000.0)
+    assert result["count"] == 300
+    assert result["trace"][-1][0] < 1000.3
+    assert simulator.verify(result, job=job) == []
+
+def test_deadline_limit():
+    start = 1.7e9
+    job = click_job(0.01, {"kind": "deadline", "value": start + 5})
+    result = simulator.simulate(job, start=start)
+    assert result["count"] == 500
+    assert simulator.verify(result, job=job) == []
+
+def test_deadline_defaults_to_now():
+    job = click_job(0.5, {"kind": "deadline", "value": 0})
+    result = simulator.simulate(job)
+    assert result["start"] > 0
+    assert result["count"] == 0
+
+def test_plan_limit():
+    assert engine.plan_limit({"kind": "count", "value": 5}, 0.1, 0) == (5, None)
+    assert engine.plan_limit({"kind": "duration", "value": 0.3}, 0.1, 0) == (3, 0.3)
+    assert engine.plan_limit({"kind": "deadline", "value": 10}, 1, 20) == (0, 10)
+    assert engine.plan_limit(None, 0.1, 0) == (None, None)
+
+def test_stall_drops_missed_ticks():
+    clock = StallClock(at=1, stall=60)
+    count, times = run_stalled(click_job(0.01, None), clock, run_for=62)
+    after = [t for t in times if t > 1]
+    # one event when the stall ends, then back on the 10ms grid
+    assert after[0] > 61
+    assert all(b - a > 0.009 for a, b in zip(after, after[1:]))
+    assert count == len(times) < 300
+
+def test_stall_past_the_end_stops_on_time():
+    clock = StallClock(at=0.5, stall=5)
+    count, times = run_stalled(click_job(0.01, {"kind": "duration", "value": 1}), clock, run_for=100)
+    assert count == len(times) <= 100
+    assert times[-1] < 1
+    assert clock.now < 6
+
+def test_stall_past_a_count_limit():
+    clock = StallClock(at=0.5, stall=5)
+    count, times = run_stalled(click_job(0.01, {"kind": "count", "value": 80}), clock, run_for=100)
+    assert count == 80
+
+def test_parse_deadline():
+    now = time.mktime((2026, 10, 19, 12, 0, 0, 0, 0, -1))
+    assert engine.parse_deadline("13:30", now=now) - now == 90 * 60
+    assert engine.parse_deadline("11:00:30", now=now) - now == 23 * 60 * 60 + 30
+    for text in ["25:00", "12:99", "12:00:60", "-1:00", "12"]:
+        with pytest.raises(ValueError):
+            engine.parse_deadline(text, now=now)
@@ -0,0 +1,51 @@
+# key sequence compile + playback, run with `python -m pytest`
+
+import pytest
+
+import engine
+import simulator
+
+def sequence_job(text, interval=0.5, limit=None):
+    timeline, length = engine.compile_sequence(text)
+    return {"mode": "KeySequence", "interval": interval, "limit": limit,
+            "timeline": timeline, "length": length}
+
+def keys(result):
+    return [(name, args["key"]) for _, name, args in result["trace"]]
+
+def test_zero_hold_presses_before_release():
+    timeline, _ = engine.compile_sequence("key,X,0,0")
+    assert [(key, down) for _, key, down, _ in timeline] == [("VK_X", True), ("VK_X", False)]
+
+    result = simulator.simulate(sequence_job("text,ab,0,0"), run_for=0.1)
+    assert keys(result) == [("key_down", "VK_A"), ("key_up", "VK_A"), ("key_down", "VK_B"), ("key_up", "VK_B")]
+
+def test_overlapping_holds_share_one_timeline():
+    job = sequence_job("key,W,0,2\nkey,SPACE,0,0.03,0.1,2", limit={"kind": "duration", "value": 2})
+    result = simulator.simulate(job)
+    assert result["counts"] == {"key_down": 21, "key_up": 21}
+    assert keys(result)[0] == ("key_down", "VK_W")
+    assert keys(result)[-1] == ("key_up", "VK_W")
+    assert simulator.verify(result, job=job) == []
+
+def test_shift_is_not_counted():
+    job = sequence_job("text,A,0,0.05", limit={"kind": "count", "value": 1})
+    result = simulator.simulate(job)
+    assert keys(result) == [("key_down", "VK_SHIFT"), ("key_down", "VK_A"), ("key_up", "VK_A"), ("key_up", "VK_SHIFT")]
+    assert result["count"] == 1
+
+def test_shifted_symbols():
+    timeline, _ = engine.compile_sequence('text,"Hi, you!",0,0.02')
+    downs = [key for _, key, down, _ in timeline if down]
+    assert downs[-2:] == ["VK_SHIFT", "VK_1"]
+    assert "VK_OEM_COMMA" in downs
+
+def test_overlapping_repeat_is_rejected():
+    with pytest.raises(ValueError):
+        engine.compile_sequence("key,X,0,0.2,0.1,1")
+
+def test_overlapping_rows_are_rejected():
+    with pytest.raises(ValueError):
+        engine.compile_sequence("key,W,0,2\nkey,W,1,0.1")
+    # back to back is fine
+    engine.compile_sequence("key,W,0,1\nkey,W,1,0.1")
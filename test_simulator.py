@@ -0,0 +1,34 @@
+# dry-run simulator checks, run with `python -m pytest`
+
+import pytest
+
+import simulator
+
+def click_job(interval, limit):
+    return {"mode": "AutoClick", "interval": interval, "limit": limit,
+            "button": "left", "location_mode": "cursor position", "x": 0, "y": 0}
+
+# ================== Simulation ==================
+
+def test_count_limit():
+    job = click_job(0.5, {"kind": "count", "value": 10})
+    result = simulator.simulate(job)
+    assert result["count"] == 10
+    assert simulator.verify(result, job=job, duration=4.5, counts={"mouse_click": 10}) == []
+
+def test_until_stopped_needs_run_for():
+    job = click_job(0.5, None)
+    with pytest.raises(ValueError):
+        simulator.simulate(job)
+    result = simulator.simulate(job, run_for=7200)
+    assert simulator.verify(result, duration=7200, counts={"mouse_click": 14400}) == []
+
+def test_zero_interval():
+    result = simulator.simulate(click_job(0, {"kind": "count", "value": 100}))
+    assert result["count"] == 100
+    assert result["duration"] == 0
+    # these would never let the virtual clock move
+    with pytest.raises(ValueError):
+        simulator.simulate(click_job(0, {"kind": "duration", "value": 1}))
+    with pytest.raises(ValueError):
+        simulator.simulate(click_job(0, None), run_for=1)
@@ -0,0 +1,97 @@
+# dispatch worker process, run with `python -m pytest`
+
+import time
+
+import pytest
+
+import simulator
+import worker
+
+def recording_backend():
+    # records instead of sending input, timestamped with the real clock
+    return simulator.SimulatedInputs(time)
+
+def click_job(interval, limit):
+    return {"mode": "AutoClick", "interval": interval, "limit": limit,
+            "button": "left", "location_mode": "cursor position", "x": 0, "y": 0}
+
+def wait_until(condition, timeout=5):
+    end = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < end, "timed out"
+        time.sleep(0.0002)
+
+@pytest.fixture
+def dispatch_worker():
+    w = worker.DispatchWorker(backend_factory=recording_backend)
+    yield w
+    w.close()
+
+def test_job_ids_hand_off(dispatch_worker):
+    dispatch_worker.run(click_job(0.001, {"kind": "count", "value": 5}))
+    wait_until(lambda: not dispatch_worker.running)
+    assert dispatch_worker.counters[worker.STARTED] == dispatch_worker.counters[worker.FINISHED] == 1
+    assert dispatch_worker.count == 5
+
+    dispatch_worker.run(click_job(0.001, {"kind": "count", "value": 3}))
+    assert dispatch_worker.running
+    wait_until(lambda: not dispatch_worker.running)
+    assert dispatch_worker.counters[worker.FINISHED] == 2
+    assert dispatch_worker.count == 3
+
+def test_stop_then_start_keeps_running(dispatch_worker):
+    dispatch_worker.run(click_job(0.01, None))
+    wait_until(lambda: dispatch_worker.count > 0)
+    dispatch_worker.stop()
+    dispatch_worker.run(click_job(0.01, None))
+    time.sleep(0.1)
+    assert dispatch_worker.running
+    assert dispatch_worker.counters[worker.STARTED] == 2
+
+    dispatch_worker.stop()
+    wait_until(lambda: not dispatch_worker.running)
+
+def test_stop_latency(dispatch_worker):
+    dispatch_worker.run(click_job(0.5, None))
+    wait_until(lambda: dispatch_worker.count > 0)
+    time.sleep(0.1)    # mid-sleep, the next event is 0.4s away
+    stopped_at = time.perf_counter()
+    dispatch_worker.stop()
+    wait_until(lambda: not dispatch_worker.running)
+    assert time.perf_counter() - stopped_at < 0.05
+    assert dispatch_worker.count == 1
+
+def test_run_mid_job_is_queued(dispatch_worker):
+    dispatch_worker.run(click_job(0.5, None))
+    wait_until(lambda: dispatch_worker.count > 0)
+    # arrives while job 1 sleeps: it must neither be dropped nor wake job 1 early
+    dispatch_worker.run(click_job(0.001, {"kind": "count", "value": 3}))
+    time.sleep(0.1)
+    assert dispatch_worker.counters[worker.STARTED] == 1
+    assert dispatch_worker.counters[worker.COUNT] == 1
+
+    dispatch_worker.stop()    # ends job 1, then the queued job 2 runs to its limit
+    wait_until(lambda: dispatch_worker.counters[worker.FINISHED] == 2)
+    assert dispatch_worker.count == 3
+
+def failing_backend():
+    class Broken:
+        def mouse_click(self, **kwargs): raise RuntimeError("no mouse here")
+    return Broken()
+
+def test_failed_job_keeps_worker_alive(capfd):
+    w = worker.DispatchWorker(backend_factory=failing_backend)
+    try:
+        w.run(click_job(0.01, None))
+        wait_until(lambda: not w.running)
+        assert w.failed
+        assert w.alive
+        assert "no mouse here" in capfd.readouterr().err
+
+        # still takes commands afterwards
+        w.stop()
+        w.run(click_job(0.01, {"kind": "count", "value": 0}))
+        wait_until(lambda: not w.running)
+        assert not w.failed
+    finally:
+        w.close()
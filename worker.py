@@ -0,0 +1,149 @@
+# process-isolated dispatch worker
+#
+# runs the engine in its own process so tk redraws and the keyboard hook
+# thread can't hold the GIL while an event is due. the ui sends compiled jobs
+# and stop commands down a pipe, and reads progress out of a small shared
+# memory block instead of waiting on messages back.
+
+import multiprocessing as mp
+import sys
+import time
+import traceback
+
+import engine
+
+# shared counter block (int64 slots), only ever written by the worker
+COUNT = 0       # events sent by job STARTED
+STARTED = 1     # id of the job the worker is running (or ran last)
+FINISHED = 2    # id of the last job that ended
+FAILED = 3      # id of the last job that ended with an error
+
+# the end of each wait is left to short time.sleep() calls: poll() timeouts are
+# whole milliseconds (and on windows, as coarse as the system timer tick)
+POLL_MARGIN = 0.002
+
+# ================== Worker Process ==================
+
+class PipeClock:
+    """
+    `time` stand-in for the worker: sleep() wakes up as soon as a stop arrives
+    on the pipe. anything else that arrives mid-job is queued in `pending`
+    for the worker loop to pick up once the job ends.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.pending = []
+        self.stopped = False
+        self.quit = False
+
+    def time(self):
+        return time.time()
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        wake = time.perf_counter() + seconds
+        while not self.stopped:
+            remaining = wake - time.perf_counter()
+            if remaining <= 0: return
+            if remaining > POLL_MARGIN:
+                # block on the pipe for the bulk of the wait so a stop lands immediately
+                if self.conn.poll(remaining - POLL_MARGIN): self.handle(self.conn.recv())
+            elif self.conn.poll():
+                self.handle(self.conn.recv())
+            else:
+                # high-res sleep on windows since python 3.11, still checking for a stop in between
+                time.sleep(min(remaining, 0.0005))
+
+    def running(self):
+        while not self.stopped and self.conn.poll():
+            self.handle(self.conn.recv())
+        return not self.stopped
+
+    def handle(self, command):
+        if command[0] == "stop":
+            self.stopped = True
+        elif command[0] == "quit":
+            self.stopped = self.quit = True
+        else:
+            self.pending.append(command)
+
+def worker_main(conn, counters, backend_factory=None):
+    if sys.platform == "win32":
+        # 1ms system timer so the pipe waits above wake up on time
+        import ctypes
+        ctypes.windll.winmm.timeBeginPeriod(1)
+
+    # None lets run_job use the real `inputs` module
+    backend = backend_factory() if backend_factory else None
+
+    pending = []
+    while True:
+        command = pending.pop(0) if pending else conn.recv()
+        if command[0] == "quit": break
+        if command[0] != "run": continue    # e.g. a stop that arrived after the job ended
+
+        _, job_id, job = command
+        clock = PipeClock(conn)
+        def on_event(count): counters[COUNT] = count
+        counters[COUNT] = 0
+        counters[STARTED] = job_id
+        try:
+            engine.run_job(job, backend=backend, clock=clock, running=clock.running, on_event=on_event)
+        except Exception:
+            # one bad job (a bad key combo, a missing module...) mustn't take the worker down with it
+            traceback.print_exc()
+            counters[FAILED] = job_id
+        finally:
+            counters[FINISHED] = job_id
+        if clock.quit: break
+        pending.extend(clock.pending)
+
+# ================== Handle ==================
+
+class DispatchWorker:
+    """
+    starts the worker process once and reuses it for every job.
+    backend_factory (a picklable callable) builds the backend inside the
+    worker; by default it sends real input through `inputs`.
+    """
+    def __init__(self, backend_factory=None):
+        self.counters = mp.RawArray("q", 4)
+        self.job_id = 0
+        self.conn, child_conn = mp.Pipe()
+        self.process = mp.Process(target=worker_main, args=(child_conn, self.counters, backend_factory), daemon=True)
+        self.process.start()
+
+    def run(self, job):
+        limit = job.get("limit")
+        if limit and limit["kind"] == "until":
+            raise ValueError("\"until\" limits can't be sent to the worker process")
+        self.job_id += 1
+        self.conn.send(("run", self.job_id, job))
+
+    def stop(self):
+        self.conn.send(("stop",))
+
+    def close(self):
+        self.conn.send(("quit",))
+        self.process.join(1)
+
+    @property
+    def count(self):
+        # the worker resets COUNT before publishing the new id, so this never shows the last job's count
+        return self.counters[COUNT] if self.counters[STARTED] == self.job_id else 0
+
+    @property
+    def alive(self):
+        return self.process.is_alive()
+
+    @property
+    def failed(self):
+        """true if the latest job ended with an error (the traceback goes to the worker's stderr)"""
+        return self.counters[FAILED] == self.job_id
+
+    @property
+    def running(self):
+        """true from run() until the worker reports that same job finished"""
+        return self.counters[FINISHED] != self.job_id and self.process.is_alive()